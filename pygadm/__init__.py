@@ -6,17 +6,30 @@ This lib provides access to GADM datasets from a Python script without downloadi
 The data are freely available for academic use and other non-commercial use. Redistribution, or commercial use is not allowed without prior permission. See the license of the GADM project for more details.
 """
 
+import gzip
+import hashlib
+import inspect
 import json
+import os
+import re
+import sqlite3
+import tempfile
+import unicodedata
 import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 from difflib import get_close_matches
 from functools import lru_cache
 from itertools import product
 from pathlib import Path
-from typing import List, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import shapely
 from deprecated.sphinx import deprecated, versionadded
 from requests_cache import CachedSession
 
@@ -27,17 +40,208 @@ __author__ = "Pierrick Rambaud"
 __email__ = "pierrick.rambaud49@gmail.com"
 
 __gadm_version__ = "410"  # 4.1
-__gadm_url__ = "https://geodata.ucdavis.edu/gadm/gadm4.1/json/gadm41_{}_{}.json"
 __gadm_data__ = Path(__file__).parent / "data" / "gadm_database.parquet"
+__gadm_alias__ = Path(__file__).parent / "data" / "gadm_alias.parquet"
+__gadm_attributes_data__ = Path(__file__).parent / "data" / "gadm_attributes.parquet"
+__gadm_cache__ = Path(tempfile.gettempdir()) / "pygadm"
+__gadm_attributes__ = ["AREA", "LON", "LAT", "MINX", "MINY", "MAXX", "MAXY", "VERTICES"]
 __gadm_continent__ = json.loads(
     (Path(__file__).parent / "data" / "gadm_continent.json").read_text()
 )
 
 
-@lru_cache(maxsize=1)
-def _df() -> pd.DataFrame:
-    """Get the parquet database."""
-    return pd.read_parquet(__gadm_data__)
+# half of the earth circumference in the web mercator projection (EPSG:3857)
+_mercator = 20037508.342789244
+
+
+def _key(name: str) -> str:
+    """
+    Build the normalized key of a name used to compare it with the names of the database.
+
+    The name is casefolded, the accents are removed and all the punctuation and whitespaces are replaced by single spaces so that "Côte d'Ivoire" and "cote d ivoire" share the same key.
+
+    Args:
+        name: The name to normalize.
+
+    Returns:
+        The normalized key.
+    """
+    name = unicodedata.normalize("NFKD", name.casefold())
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[\W_]+", " ", name).split())
+
+
+def _keys(names: pd.Series) -> pd.Series:
+    """Build the normalized keys of a Series of names, each unique name is only normalized once."""
+    return names.map({n: _key(n) for n in names.unique()})
+
+
+# the GADM version used by the current context, see gadm_version
+_version = ContextVar("gadm_version", default=__gadm_version__)
+
+
+def _data_file(file: Path, version: str) -> Path:
+    """Get the path to a data file of a specific GADM version, the default version files have no suffix."""
+    return (
+        file
+        if version == __gadm_version__
+        else file.with_name(f"{file.stem}_{version}{file.suffix}")
+    )
+
+
+def _url(version: str) -> str:
+    """Get the url template of the GeoJSON files of a specific GADM version."""
+    major, minor = version[0], version[1]
+    return f"https://geodata.ucdavis.edu/gadm/gadm{major}.{minor}/json/gadm{major}{minor}_{{}}_{{}}.json"
+
+
+# the url template of the default GADM version, the requests are using the version of their context
+__gadm_url__ = _url(__gadm_version__)
+
+
+@versionadded(version="0.5.4", reason="Add the gadm_version context manager.")
+@contextmanager
+def gadm_version(version: str) -> Iterator[str]:
+    """
+    Set the GADM version used by all the requests made in the context.
+
+    Each version uses its own database and its own cache, they are loaded on the first request and kept in memory so that several versions can be used in the same process without reloading them. The database of a version is created by the "refresh_database.py" script.
+
+    Example:
+        .. code-block:: python
+
+            import pygadm
+
+            with pygadm.gadm_version("400"):
+                gdf = pygadm.Items(name="Singapore")
+
+    Args:
+        version: The GADM version without the dots e.g. "410" for 4.1.
+
+    Yields:
+        The GADM version.
+    """
+    if not _data_file(__gadm_data__, version).is_file():
+        available = [__gadm_version__]
+        available += [f.stem.split("_")[-1] for f in __gadm_data__.parent.glob("gadm_database_*")]
+        raise ValueError(
+            f'The GADM version "{version}" is not available. '
+            f'The available versions are: {", ".join(sorted(available))}.'
+        )
+
+    token = _version.set(version)
+    try:
+        yield version
+    finally:
+        _version.reset(token)
+
+
+@lru_cache(maxsize=None)
+def _df(version: str = __gadm_version__) -> pd.DataFrame:
+    """Get the parquet database of a GADM version."""
+    df = pd.read_parquet(_data_file(__gadm_data__, version))
+
+    # the normalized keys are computed when the database is built,
+    # only older databases need to compute them on the fly
+    for i in range(6):
+        if f"KEY_{i}" not in df.columns:
+            df[f"KEY_{i}"] = _keys(df[f"NAME_{i}"])
+
+    return df
+
+
+@lru_cache(maxsize=None)
+def _alias_df(version: str = __gadm_version__) -> pd.DataFrame:
+    """Get the parquet index of alternative names, only loaded when an alias search is requested."""
+    file = _data_file(__gadm_alias__, version)
+    if not file.is_file():
+        raise ValueError(
+            "The alternative names are not available in the current database. "
+            'Build them with the "refresh_database.py" script.'
+        )
+    return pd.read_parquet(file)
+
+
+@lru_cache(maxsize=None)
+def _attributes_df(version: str = __gadm_version__) -> pd.DataFrame:
+    """Get the parquet table of geometry attributes indexed by GID, only loaded when they are requested."""
+    file = _data_file(__gadm_attributes_data__, version)
+    if not file.is_file():
+        raise ValueError(
+            "The attributes are not available in the current database. "
+            'Build them with the "refresh_database.py" script.'
+        )
+    return pd.read_parquet(file).set_index("GID")
+
+
+def _requests(
+    name: Union[str, List[str]] = "", admin: Union[str, List[str]] = ""
+) -> List[Tuple[str, str]]:
+    """
+    Split a request into the list of single (name, admin) requests to send to the GADM server.
+
+    Args:
+        name: The name of an administrative area or a list of names. Continent names are expanded into their countries.
+        admin: The id of an administrative area in the GADM nomenclature or a list of ids.
+
+    Returns:
+        The list of (name, admin) pairs.
+    """
+    # set up the loop
+    names = [name] if isinstance(name, str) else name
+    admins = [admin] if isinstance(admin, str) else admin
+
+    # check that they are not all empty
+    if names == [""] == admins:
+        raise ValueError('at least "name" or "admin" need to be set.')
+
+    # special parsing for continents. They are saved as admins to avoid any duplication
+    if len(names) == 1 and names[0].lower() in __gadm_continent__:
+        admins = [c for c in __gadm_continent__[names[0].lower()]]
+        names = [""]
+
+    # use itertools, normally one of them is empty so it will raise an error
+    # if not the case as admin and name will be set together
+    return [(n, a) for a, n in product(admins, names)]
+
+
+def _polygons(geometries: np.ndarray) -> np.ndarray:
+    """
+    Keep only the polygonal parts of an array of geometries.
+
+    Args:
+        geometries: The shapely geometries.
+
+    Returns:
+        The polygons and multipolygons of the array, the collections are reduced to their polygons and the other geometries are replaced by empty polygons.
+    """
+    geometries = geometries.copy()
+    for i in np.flatnonzero(~np.isin(shapely.get_type_id(geometries), [3, 6])):
+        parts = shapely.get_parts(geometries[i])
+        polygons = shapely.get_parts(parts[np.isin(shapely.get_type_id(parts), [3, 6])])
+        geometries[i] = shapely.multipolygons(polygons) if len(polygons) else shapely.Polygon()
+
+    return geometries
+
+
+def _encode_tile(task: tuple) -> tuple:
+    """
+    Encode the clipped features of a single tile in the Mapbox Vector Tile format.
+
+    Args:
+        task: the tile coordinates (z, x, y), the layer name, the tile extent and the list of (geometry, properties) features.
+
+    Returns:
+        The tile coordinates and the encoded tile.
+    """
+    import mapbox_vector_tile
+
+    (z, x, y), layer, extent, features = task
+    size = 2 * _mercator / 2**z
+    xmin, ymax = -_mercator + x * size, _mercator - y * size
+    layers = [{"name": layer, "features": [{"geometry": g, "properties": p} for g, p in features]}]
+    options = {"quantize_bounds": (xmin, ymax - size, xmin + size, ymax), "extents": extent}
+    return (z, x, y), mapbox_vector_tile.encode(layers, default_options=options)
 
 
 @versionadded(version="0.5.2", reason="Add the Names class.")
@@ -48,6 +252,8 @@ class Names(pd.DataFrame):
         admin: str = "",
         content_level: int = -1,
         complete: bool = False,
+        alias: bool = False,
+        attributes: bool = False,
     ):
         """
         Set the list of names available in a administrative layer using the name or the administrative code.
@@ -59,6 +265,8 @@ class Names(pd.DataFrame):
             admin: The id of an administrative area in the GADM nomenclature. Cannot be set along with :code:`name`.
             content_level: The level to use in the final dataset. Default to -1 (use level of the selected area).
             complete: If True, the method will return all the names of the higher administrative areas. Default to False.
+            alias: If True, the :code:`name` is also searched in the alternative names of the areas (variant spellings and names in local scripts) when it doesn't match any official name. Default to False.
+            attributes: If True, the method will also return the geodesic area (km²), the coordinates of a point inside the area ("LON", "LAT"), the bounding box ("MINX", "MINY", "MAXX", "MAXY") and the number of vertices of the geometry of each area. Default to False.
         """
         # sanitary check on parameters
         if name and admin:
@@ -66,21 +274,27 @@ class Names(pd.DataFrame):
 
         # if a name or admin number is set, we need to filter the dataset accordingly
         # if not we will simply consider the world dataset
-        df = _df()
+        df = _df(_version.get())
         if name or admin:
             # set the id we look for and tell the function if its a name or an admin
             is_name = True if name else False
             id = name if name else admin
 
             # read the data and find if the element exist
+            # names are compared using their normalized keys and GADM codes are all upper case
             column = "NAME_{}" if is_name else "GID_{}"
-            is_in = (
-                df.filter([column.format(i) for i in range(6)])
-                .apply(lambda col: col.str.lower())
-                .isin([id.lower()])
-            )
+            key_column = "KEY_{}" if is_name else "GID_{}"
+            key = _key(id) if is_name else id.upper()
+            # a name made only of punctuation has an empty key that should not match anything
+            is_in = df.filter([key_column.format(i) for i in range(6)]).isin([key] if key else [])
 
-            if not is_in.any().any():
+            # search the alternative names only if the official ones don't match anything
+            alias_df = pd.DataFrame()
+            if is_name and alias and not is_in.any().any():
+                alias_df = _alias_df(_version.get())
+                alias_df = alias_df[alias_df.KEY == key]
+
+            if not is_in.any().any() and alias_df.empty:
                 # find the 5 closest names/id
                 columns = [df[column.format(i)].dropna().str.lower().values for i in range(6)]
                 ids = np.unique(np.concatenate(columns))
@@ -94,12 +308,18 @@ class Names(pd.DataFrame):
                     f'The closest matches are: {", ".join(close_ids)}.'
                 )
 
-            # Get the iso_3 of the associated country of the identifed area and the associated level
-            line = is_in[~((~is_in).all(axis=1))].idxmax(1)
-            level = line.iloc[0][5 if is_name else 4]  # GID_ or NAME_
+            if alias_df.empty:
+                # Get the iso_3 of the associated country of the identifed area and the associated level
+                line = is_in[~((~is_in).all(axis=1))].idxmax(1)
+                level = line.iloc[0][4]  # GID_ or KEY_
 
-            # load the max_level available in the requested area
-            sub_df = df[df[column.format(level)].str.fullmatch(id, case=False)]
+                # load the max_level available in the requested area
+                sub_df = df[df[key_column.format(level)] == key]
+            else:
+                # keep the biggest areas named after the alias
+                level = alias_df.LEVEL.min()
+                gids = alias_df[alias_df.LEVEL == level].GID
+                sub_df = df[df[f"GID_{level}"].isin(gids)]
             max_level = next(i for i in reversed(range(6)) if (sub_df[f"GID_{i}"] != "").any())
 
             # get the request level from user
@@ -136,18 +356,38 @@ class Names(pd.DataFrame):
         sub_df = sub_df[sub_df[columns[0]].astype(bool)]
 
         # filter the df if complete is set to False, the only displayed columns will be the one requested
+        # the normalized keys are only used internally to compare names
         final_df = sub_df if complete is True else sub_df[columns]
+        final_df = final_df.drop(columns=[f"KEY_{i}" for i in range(6)], errors="ignore")
+
+        # the geometry attributes are stored in a separated table only loaded on demand
+        if attributes is True:
+            final_df = final_df.join(_attributes_df(_version.get()), on=columns[1])
 
         super().__init__(final_df)
 
 
+class _GeoDataFrame(gpd.GeoDataFrame):
+    """Base class of the GeoDataFrames built from a request to GADM."""
+
+    @property
+    def _constructor(self):
+        # dataframes derived from a request are not new requests, they are simple GeoDataFrames
+        return gpd.GeoDataFrame._geodataframe_constructor_with_fallback
+
+    def _constructor_from_mgr(self, mgr, axes):
+        return self._constructor(pd.DataFrame._from_mgr(mgr, axes))
+
+
 @versionadded(version="0.5.2", reason="Add the Items class.")
-class Items(gpd.GeoDataFrame):
+class Items(_GeoDataFrame):
     def __init__(
         self,
         name: Union[str, List[str]] = "",
         admin: Union[str, List[str]] = "",
         content_level: int = -1,
+        alias: bool = False,
+        validate: str = "",
     ):
         """
         Return the requested administrative boundaries using the name or the administrative code.
@@ -158,30 +398,33 @@ class Items(gpd.GeoDataFrame):
             name: The name of an administrative area. Cannot be set along with :code:`admin`. it can be a list or a single name.
             admin: The id of an administrative area in the GADM nomenclature. Cannot be set along with :code:`name`. It can be a list or a single admin code.
             content_level: The level to use in the final dataset. Default to -1 (use level from the area).
+            alias: If True, the names are also searched in the alternative names of the areas. Default to False.
+            validate: Set to "repair" to fix the invalid geometries when they are loaded. The GADM codes of the repaired areas are listed in :code:`attrs["repaired"]`. Default to "" (keep the geometries as is).
         """
-        # set up the loop
-        names = [name] if isinstance(name, str) else name
-        admins = [admin] if isinstance(admin, str) else admin
-
-        # check that they are not all empty
-        if names == [""] == admins:
-            raise ValueError('at least "name" or "admin" need to be set.')
-
-        # special parsing for continents. They are saved as admins to avoid any duplication
-        if len(names) == 1 and names[0].lower() in __gadm_continent__:
-            admins = [c for c in __gadm_continent__[names[0].lower()]]
-            names = [""]
-
-        # use itertools, normally one of them is empty so it will raise an error
-        # if not the case as admin and name will be set together
-        gdf_list = [self._items(n, a, content_level) for a, n in product(admins, names)]
+        requests = _requests(name, admin)
+        gdf_list = [self._items(n, a, content_level, alias, validate) for n, a in requests]
 
         # avoid concat if not needed for speed boost
         gdf = gdf_list[0] if len(gdf_list) == 1 else pd.concat(gdf_list)
 
+        # report the repaired geometries without keeping the flag in the attributes
+        repaired = gdf.pop("REPAIRED") if "REPAIRED" in gdf.columns else None
+
         super().__init__(gdf)
 
-    def _items(self, name: str = "", admin: str = "", content_level: int = -1) -> gpd.GeoDataFrame:
+        if repaired is not None:
+            self.attrs["repaired"] = gdf.loc[
+                repaired.to_numpy(), f"GID_{_content_level(gdf)}"
+            ].tolist()
+
+    def _items(
+        self,
+        name: str = "",
+        admin: str = "",
+        content_level: int = -1,
+        alias: bool = False,
+        validate: str = "",
+    ) -> gpd.GeoDataFrame:
         """
         Return the requested administrative boundaries from the single name or administrative code.
 
@@ -189,12 +432,14 @@ class Items(gpd.GeoDataFrame):
             name: The name of an administrative area. Cannot be set along with :code:`admin`.
             admin: The id of an administrative area in the GADM nomenclature. Cannot be set along with :code:`name`.
             content_level: The level to use in the final dataset. Default to -1 (use level from the area).
+            alias: If True, the name is also searched in the alternative names of the areas. Default to False.
+            validate: Set to "repair" to fix the invalid geometries. Default to "" (keep the geometries as is).
 
         Returns:
             The GeoDataFrame of the requested area with all the GADM attributes.
         """
         # call to Names without level to raise an error if the requested level won't work
-        df = Names(name, admin)
+        df = Names(name, admin, alias=alias)
         if len(df) > 1:
             raise ValueError(
                 f'The requested name ("{name}") is not unique ({len(df)} results). '
@@ -203,33 +448,15 @@ class Items(gpd.GeoDataFrame):
                 f'it will return the GADM codes as well: "Names(name="{name}")"'
             )
         level = df.columns[0].replace("NAME_", "")
-        iso_3 = df.iloc[0][f"GID_{level}"][:3]
+        gids = df[f"GID_{level}"]
+        iso_3 = gids.iloc[0][:3]
 
         # now load the useful one to get content_level
-        df = Names(name, admin, content_level)
+        df = Names(name, admin, content_level, alias=alias)
         content_level = df.columns[0].replace("NAME_", "")
 
-        # checks have already been performed in Names
-        column = "NAME_{}" if name else "GID_{}"
-        id = name if name else admin
-
         # read the data from server
-        url = __gadm_url__.format(iso_3, content_level)
-        try:
-            data = json.loads(session.get(url).content)
-        except Exception:
-            # The data url is automatically build, it should be correct. From time
-            # to time the server are down from GADM side so we write down a specific
-            # error message if something goes wrong
-            raise Exception(
-                "We cannot retrieve the data from GADM server. "
-                f"Try to manually open the following link: {url}. "
-                "If it doesn't work, the error is coming from GADM servers. "
-                "If it works please open an issue on our repository: https://github.com/12rambau/pygadm/issues."
-            )
-
-        level_gdf = gpd.GeoDataFrame.from_features(data)
-        level_gdf = level_gdf.rename(columns={"COUNTRY": "NAME_0"})
+        level_gdf = _load(iso_3, int(content_level), validate)
 
         # countries can embed multiple iso codes as some places are disputed so we need to gather them
         # from the geojson file
@@ -253,11 +480,572 @@ class Items(gpd.GeoDataFrame):
         drop_cols = [f"NAME_{i}" for i in range(int(content_level) + 1)]
         gdf = pd.merge(level_gdf.drop(drop_cols, axis=1), complete_df, how="inner", on=shared_cols)
 
-        # now we can filter this dataframe with the appropriate name or admin code
-        gdf = gdf[gdf[column.format(level)].str.fullmatch(id, case=False)]
+        # now we can filter this dataframe with the code of the identified area
+        # checks have already been performed in Names
+        gdf = gdf[gdf[f"GID_{level}"].isin(gids)]
 
         return gdf
 
+    @versionadded(version="0.5.4", reason="Add the dissolve_to method.")
+    def dissolve_to(
+        self, level: int, groups: Optional[Dict[str, List[str]]] = None, method: str = "unary"
+    ) -> gpd.GeoDataFrame:
+        """
+        Aggregate the loaded areas into a coarser administrative level without requesting the GADM server again.
+
+        The geometries are merged by their :code:`GID_{level}` code so the level 1 and level 2 of a country can be obtained from a single level 2 request. Custom groupings (e.g. sales regions) can be provided as a dictionary of GADM codes. Results are cached on the object so requesting the same aggregation of the same data twice is free.
+
+        Args:
+            level: The administrative level to aggregate to. It cannot be smaller than the content level of the loaded areas. If :code:`groups` is set, it's the level of the codes used in the groups.
+            groups: A dictionary of custom groups using the group names as keys and a list of GADM codes of the :code:`level` as values. Areas that are not part of any group are dropped. Default to None (aggregate on the GADM codes).
+            method: The method used to merge the geometries, either "unary" or "coverage". "coverage" is much faster but requires non-overlapping geometries and geopandas>=1.0. Default to "unary".
+
+        Returns:
+            The GeoDataFrame of the aggregated areas.
+        """
+        # the finest level available in the loaded data
+        content_level = _content_level(self)
+        if level > content_level:
+            raise ValueError(
+                f"The requested level ({level}) is smaller than the loaded areas ({content_level}). "
+                "Request the smaller areas with the content_level parameter instead."
+            )
+
+        # work on a pure GeoDataFrame to avoid rebuilding Items objects in the pandas operations
+        items = gpd.GeoDataFrame(self)
+        if groups:
+            lookup = {gid: group for group, gids in groups.items() for gid in gids}
+            gdf = gpd.GeoDataFrame(
+                {"group": items[f"GID_{level}"].map(lookup).values},
+                geometry=items.geometry.values,
+                crs=items.crs,
+            )
+            by = "group"
+        else:
+            # only keep the attributes that remain true for the aggregated areas
+            columns = [f"GID_{i}" for i in range(level + 1)]
+            columns += [f"NAME_{i}" for i in range(level + 1)]
+            gdf = items[[*columns, items.geometry.name]]
+            by = f"GID_{level}"
+
+        # the cache is keyed on the content of the aggregated data so it never goes stale if the
+        # object is modified in place. It lives in the object __dict__ to not be shared with slices
+        hashes = pd.util.hash_pandas_object(gdf.to_wkb(), index=False).to_numpy()
+        key = (hashlib.md5(hashes.tobytes()).hexdigest(), by, method)
+        dissolved = self.__dict__.setdefault("_dissolved", {})
+        if key not in dissolved:
+            # the method option of dissolve only exists from geopandas 1.0, older versions are
+            # always using the unary union
+            kwargs = {} if method == "unary" else {"method": method}
+            if kwargs and "method" not in inspect.signature(gpd.GeoDataFrame.dissolve).parameters:
+                raise ValueError(f'The "{method}" method requires geopandas>=1.0.')
+
+            # dropna remove the areas that are not part of any group
+            gdf = gdf.dissolve(by=by, as_index=False, dropna=True, **kwargs)[gdf.columns]
+            dissolved[key] = gdf
+
+        return dissolved[key].copy()
+
+    @versionadded(version="0.5.4", reason="Add the to_tiles method.")
+    def to_tiles(
+        self,
+        path: Union[str, Path],
+        min_zoom: int = 0,
+        max_zoom: int = 8,
+        layer: str = "gadm",
+        extent: int = 4096,
+        buffer: int = 64,
+        max_workers: Optional[int] = None,
+    ) -> Path:
+        """
+        Generate the Mapbox Vector Tiles of the loaded areas.
+
+        The geometries are simplified to the pixel size of each zoom level and clipped to the tiles in a single vectorized pass. The tiles are then encoded in parallel on all the available cores. If the path ends with ".mbtiles", the tiles are saved in a MBTiles archive, if not they are saved in a "{z}/{x}/{y}.pbf" directory tree.
+
+        Note:
+            This method requires the :code:`mapbox-vector-tile` package. Install it with :code:`pip install pygadm[tiles]`.
+
+        Args:
+            path: The destination of the tiles, a directory or a ".mbtiles" file.
+            min_zoom: The smallest zoom level to generate. Default to 0.
+            max_zoom: The biggest zoom level to generate. Default to 8.
+            layer: The name of the layer in the tiles. Default to "gadm".
+            extent: The number of units in a tile side. Default to 4096.
+            buffer: The number of units added around each tile to avoid rendering artifacts on the borders. Default to 64.
+            max_workers: The number of processes used to encode the tiles. Default to None (all the cores).
+
+        Returns:
+            The path to the generated tiles.
+        """
+        try:
+            import mapbox_vector_tile  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                'The "mapbox-vector-tile" package is required to generate tiles. '
+                'Install it with "pip install pygadm[tiles]".'
+            )
+
+        # the web mercator projection is not defined at the poles
+        # all the attributes are saved as strings in the tiles
+        gdf = gpd.GeoDataFrame(self)
+        gdf.geometry = gdf.geometry.clip_by_rect(-180, -85.0511, 180, 85.0511)
+        gdf = gdf.to_crs(epsg=3857)
+        properties = gdf.drop(columns=gdf.geometry.name).fillna("").astype(str).to_dict("records")
+        geometries = gdf.geometry.values
+
+        path = Path(path)
+        if path.suffix == ".mbtiles":
+            path.unlink(missing_ok=True)
+            con = sqlite3.connect(path)
+            con.execute("CREATE TABLE metadata (name text, value text)")
+            con.execute(
+                "CREATE TABLE tiles (zoom_level integer, tile_column integer, tile_row integer, tile_data blob)"
+            )
+            lon_min, lat_min, lon_max, lat_max = gpd.GeoSeries(geometries).to_crs(4326).total_bounds
+            metadata = {
+                "name": layer,
+                "format": "pbf",
+                "minzoom": min_zoom,
+                "maxzoom": max_zoom,
+                "bounds": f"{lon_min},{lat_min},{lon_max},{lat_max}",
+                "json": json.dumps({"vector_layers": [{"id": layer, "fields": {}}]}),
+            }
+            con.executemany(
+                "INSERT INTO metadata VALUES (?, ?)", [(k, str(v)) for k, v in metadata.items()]
+            )
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for z in range(min_zoom, max_zoom + 1):
+                # simplify the geometries to the pixel size of the zoom level
+                size = 2 * _mercator / 2**z
+                simplified = shapely.simplify(geometries, size / extent)
+
+                # find the tiles covering the bounding box of each geometry
+                margin = size * buffer / extent
+                bounds = shapely.bounds(simplified)
+                x_range = np.clip((bounds[:, [0, 2]] + _mercator) // size, 0, 2**z - 1).astype(int)
+                y_range = np.clip((_mercator - bounds[:, [3, 1]]) // size, 0, 2**z - 1).astype(int)
+                tiles = sorted(
+                    {
+                        (z, x, y)
+                        for (x0, x1), (y0, y1) in zip(x_range, y_range)
+                        for x in range(x0, x1 + 1)
+                        for y in range(y0, y1 + 1)
+                    }
+                )
+                xy = np.array([(x, y) for _, x, y in tiles]).reshape(-1, 2)
+                xmin, ymax = -_mercator + xy[:, 0] * size, _mercator - xy[:, 1] * size
+                boxes = shapely.box(
+                    xmin - margin, ymax - size - margin, xmin + size + margin, ymax + margin
+                )
+
+                # clip all the geometries to the tiles they intersect at once
+                tile_idx, geom_idx = shapely.STRtree(simplified).query(
+                    boxes, predicate="intersects"
+                )
+                clipped = shapely.intersection(simplified[geom_idx], boxes[tile_idx])
+                # the clipping can produce lines or collections when a polygon runs along the tile edge,
+                # only the polygonal parts are kept
+                clipped = _polygons(clipped)
+                keep = ~shapely.is_empty(clipped)
+                features: Dict[int, list] = {}
+                for t, g, geom in zip(tile_idx[keep], geom_idx[keep], clipped[keep]):
+                    features.setdefault(t, []).append((geom, properties[g]))
+
+                tasks = ((tiles[t], layer, extent, f) for t, f in features.items())
+                for (_, x, y), data in executor.map(_encode_tile, tasks, chunksize=64):
+                    if path.suffix == ".mbtiles":
+                        # MBTiles are using the TMS scheme with the y axis flipped
+                        values = (z, x, 2**z - 1 - y, gzip.compress(data))
+                        con.execute("INSERT INTO tiles VALUES (?, ?, ?, ?)", values)
+                    else:
+                        file = path / str(z) / str(x) / f"{y}.pbf"
+                        file.parent.mkdir(parents=True, exist_ok=True)
+                        file.write_bytes(data)
+
+        if path.suffix == ".mbtiles":
+            con.execute(
+                "CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)"
+            )
+            con.commit()
+            con.close()
+
+        return path
+
+
+def _content_level(df: pd.DataFrame) -> int:
+    """Get the finest administrative level of a dataframe, higher levels are set to empty strings."""
+    return max(i for i in range(6) if f"GID_{i}" in df.columns and (df[f"GID_{i}"] != "").any())
+
+
+def _load(iso_3: str, level: int, validate: str = "") -> gpd.GeoDataFrame:
+    """
+    Load the GADM file of a country at a specific level.
+
+    Args:
+        iso_3: The ISO alpha-3 code of the country.
+        level: The administrative level of the areas.
+        validate: Set to "repair" to fix the invalid geometries. The repaired file is saved in the cache folder so the repair is only done once per country and level. Default to "" (keep the geometries as is).
+
+    Returns:
+        The GeoDataFrame of all the areas of the file. When repaired, the "REPAIRED" column flags the fixed geometries.
+    """
+    if validate not in ["", "repair"]:
+        raise ValueError(f'The validate option "{validate}" is not supported, use "" or "repair".')
+
+    version = _version.get()
+    file = __gadm_cache__ / version / f"{iso_3}_{level}_valid.parquet"
+    if validate == "repair" and file.is_file():
+        return gpd.read_parquet(file)
+
+    url = _url(version).format(iso_3, level)
+    try:
+        data = json.loads(session.get(url).content)
+    except Exception:
+        # The data url is automatically build, it should be correct. From time
+        # to time the server are down from GADM side so we write down a specific
+        # error message if something goes wrong
+        raise Exception(
+            "We cannot retrieve the data from GADM server. "
+            f"Try to manually open the following link: {url}. "
+            "If it doesn't work, the error is coming from GADM servers. "
+            "If it works please open an issue on our repository: https://github.com/12rambau/pygadm/issues."
+        )
+
+    # GeoJSON files are always in WGS84
+    gdf = gpd.GeoDataFrame.from_features(data, crs=4326)
+    gdf = gdf.rename(columns={"COUNTRY": "NAME_0"})
+
+    if validate == "repair":
+        # check and fix all the geometries at once, keeping only the polygonal parts
+        geometries = gdf.geometry.values
+        invalid = ~shapely.is_valid(geometries)
+        repaired = _polygons(shapely.make_valid(geometries[invalid]))
+        gdf.loc[invalid, gdf.geometry.name] = repaired
+        gdf["REPAIRED"] = invalid
+        file.parent.mkdir(parents=True, exist_ok=True)
+        gdf.to_parquet(file)
+
+    return gdf
+
+
+@lru_cache(maxsize=None)
+def _adjacency(iso_3: str, level: int, version: str) -> pd.DataFrame:
+    """
+    Get the adjacency table of all the areas of a country at a specific level.
+
+    The table is computed once from the geometries of the areas and saved in the cache folder.
+
+    Args:
+        iso_3: The ISO alpha-3 code of the country.
+        level: The administrative level of the areas.
+        version: The GADM version of the areas.
+
+    Returns:
+        The table of all the pairs of touching areas.
+    """
+    file = __gadm_cache__ / version / f"adjacency_{iso_3}_{level}.parquet"
+    if file.is_file():
+        return pd.read_parquet(file)
+
+    # GADM areas are sharing their borders so touching areas are intersecting
+    gdf = gpd.GeoDataFrame(Items(admin=iso_3, content_level=level))
+    geometries = gdf.geometry.values
+    left, right = shapely.STRtree(geometries).query(geometries, predicate="intersects")
+    left, right = left[left != right], right[left != right]
+
+    gids, names = gdf[f"GID_{level}"].to_numpy(), gdf[f"NAME_{level}"].to_numpy()
+    df = pd.DataFrame({"GID": gids[left], "NEIGHBOR": gids[right], "NAME": names[right]})
+
+    file.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(file)
+
+    return df
+
+
+@versionadded(version="0.5.4", reason="Add the Neighbors class.")
+class Neighbors(pd.DataFrame):
+    def __init__(self, name: Union[str, List[str]] = "", admin: Union[str, List[str]] = ""):
+        """
+        Return the areas bordering the requested administrative areas.
+
+        Return a pandas DataFrame listing the GADM code of each requested area ("GID") along with the code ("NEIGHBOR") and name ("NAME") of each area of the same level that shares a border with it. The neighbors are computed once per country and level from the GADM geometries and cached for the next requests. Only the areas from the same country are considered: the neighbors across a national border are not included and countries (level 0) cannot be requested.
+
+        Args:
+            name: The name of an administrative area. Cannot be set along with :code:`admin`. it can be a list or a single name.
+            admin: The id of an administrative area in the GADM nomenclature. Cannot be set along with :code:`name`. It can be a list or a single admin code.
+        """
+        df_list = []
+        for n, a in _requests(name, admin):
+            df = Names(n, a)
+            level = int(df.columns[0].replace("NAME_", ""))
+            if level == 0:
+                raise ValueError(
+                    f'The requested area ("{n or a}") is a country. '
+                    "The neighbors are only computed between the areas of the same country."
+                )
+            gids = df[f"GID_{level}"]
+            for iso_3, country_gids in gids.groupby(gids.str[:3]):
+                adjacency = _adjacency(iso_3, level, _version.get())
+                df_list.append(adjacency[adjacency.GID.isin(country_gids)])
+
+        super().__init__(pd.concat(df_list, ignore_index=True))
+
+
+@lru_cache(maxsize=None)
+def _region(requests: Tuple[Tuple[str, str], ...], version: str) -> shapely.Geometry:
+    """
+    Get the dissolved geometry of a set of areas.
+
+    The geometry is built once from the geometries of all the areas and saved in the cache folder.
+
+    Args:
+        requests: The sorted (name, admin) pairs of the areas.
+        version: The GADM version of the areas.
+
+    Returns:
+        The union of all the areas.
+    """
+    key = hashlib.md5(json.dumps(requests).encode()).hexdigest()
+    file = __gadm_cache__ / version / f"region_{key}.parquet"
+    if file.is_file():
+        return gpd.read_parquet(file).geometry.iloc[0]
+
+    geometries = [Items(n, a).geometry.values for n, a in requests]
+    geometry = shapely.union_all(np.concatenate(geometries))
+
+    file.parent.mkdir(parents=True, exist_ok=True)
+    gpd.GeoDataFrame(geometry=[geometry], crs=4326).to_parquet(file)
+
+    return geometry
+
+
+@versionadded(version="0.5.4", reason="Add the Region class.")
+class Region(_GeoDataFrame):
+    def __init__(
+        self,
+        name: Union[str, List[str]] = "",
+        admin: Union[str, List[str]] = "",
+        tolerance: float = 0.0,
+    ):
+        """
+        Return the outline of a continent or of a custom region made of several administrative areas.
+
+        Return a Geopandas GeoDataFrame with a single feature merging all the requested areas. The outline is built on the first request and cached as a single file so the next requests don't need to download all the areas again. Continents can be requested by name like in :code:`Items`, custom regions are set with lists of names or administrative codes.
+
+        Args:
+            name: The name of a continent or of an administrative area. Cannot be set along with :code:`admin`. it can be a list or a single name.
+            admin: The id of an administrative area in the GADM nomenclature. Cannot be set along with :code:`name`. It can be a list or a single admin code.
+            tolerance: The tolerance used to simplify the outline in degrees. Default to 0 (no simplification).
+        """
+        # the same set of areas always use the same cached geometry whatever the order of the request
+        requests = tuple(sorted(_requests(name, admin)))
+        geometry = _region(requests, _version.get())
+        if tolerance > 0:
+            geometry = shapely.simplify(geometry, tolerance)
+
+        region = name if isinstance(name, str) else ", ".join(name)
+        region = region or (admin if isinstance(admin, str) else ", ".join(admin))
+        super().__init__({"NAME": [region]}, geometry=[geometry], crs=4326)
+
+
+# only the grids up to 16 million cells are cached, the bigger ones are computed for each request
+_max_cached_cells = 2**24
+
+
+@lru_cache(maxsize=8)
+def _labels(
+    requests: Tuple[Tuple[str, str], ...],
+    content_level: int,
+    transform: Tuple[float, ...],
+    shape: Tuple[int, int],
+    version: str,
+) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """
+    Get the label grid of a set of areas, see :code:`rasterize` for the parameters.
+
+    Returns:
+        The read-only label grid and the GADM codes of the labels.
+    """
+    gdf = pd.concat([Items(n, a, content_level) for n, a in requests])
+    gids = tuple(gdf[f"GID_{_content_level(gdf)}"])
+    tree = shapely.STRtree(gdf.geometry.values)
+
+    # test the center of all the cells at once, block by block to keep the memory usage low
+    a, b, c, d, e, f = transform
+    height, width = shape
+    # use the smallest integer type that can store all the labels
+    labels = np.zeros(shape, dtype=np.min_scalar_type(len(gids)))
+    block = max(1, 2**20 // width)
+    for start in range(0, height, block):
+        rows, cols = np.mgrid[start : min(start + block, height), 0:width] + 0.5
+        points = shapely.points(a * cols + b * rows + c, d * cols + e * rows + f)
+        point_idx, geom_idx = tree.query(points.ravel(), predicate="within")
+        labels.ravel()[start * width + point_idx] = geom_idx + 1
+
+    # the grid is shared by all the calls with the same parameters
+    labels.flags.writeable = False
+
+    return labels, gids
+
+
+@versionadded(version="0.5.4", reason="Add the rasterize function.")
+def rasterize(
+    transform: Tuple[float, ...],
+    shape: Tuple[int, int],
+    name: Union[str, List[str]] = "",
+    admin: Union[str, List[str]] = "",
+    content_level: int = -1,
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Burn the requested administrative areas in an integer label grid.
+
+    The center of every cell of the grid is tested against all the areas at once. The last grids of up to 16 million cells are cached so the same grid can be requested again for free, bigger grids are computed again for each request. The label of a cell is the position of its area in the returned list of GADM codes plus 1, cells outside of all the areas are set to 0. The grid uses the smallest unsigned integer type that can store all the labels.
+
+    Args:
+        transform: The affine transform of the grid as (a, b, c, d, e, f) coefficients, in the same order as the :code:`affine` and :code:`rasterio` packages. An :code:`Affine` object can be used directly.
+        shape: The (height, width) of the grid.
+        name: The name of an administrative area. Cannot be set along with :code:`admin`. it can be a list or a single name.
+        admin: The id of an administrative area in the GADM nomenclature. Cannot be set along with :code:`name`. It can be a list or a single admin code.
+        content_level: The level to use in the final dataset. Default to -1 (use level from the area).
+
+    Returns:
+        The read-only label grid and the list of GADM codes of the labels.
+    """
+    requests = tuple(_requests(name, admin))
+    transform = tuple(float(v) for v in tuple(transform)[:6])
+    height, width = int(shape[0]), int(shape[1])
+    labels_func = _labels if height * width <= _max_cached_cells else _labels.__wrapped__
+    labels, gids = labels_func(requests, content_level, transform, (height, width), _version.get())
+
+    return labels, list(gids)
+
+
+@versionadded(version="0.5.4", reason="Add the zonal_stats function.")
+def zonal_stats(
+    values: np.ndarray, labels: np.ndarray, gids: List[str], stats: Union[str, List[str]] = "mean"
+) -> pd.DataFrame:
+    """
+    Aggregate the values of a grid in each administrative area of a label grid.
+
+    Args:
+        values: The grid of values, it must have the same shape as the labels. NaN values are ignored.
+        labels: The label grid returned by :code:`rasterize`.
+        gids: The GADM codes returned by :code:`rasterize`.
+        stats: The name of a pandas aggregation function or a list of them e.g. "mean", "sum", "min", "max", "std", "count". Default to "mean".
+
+    Returns:
+        The statistics of each area, indexed by GADM code.
+    """
+    values, labels = np.asarray(values), np.asarray(labels)
+    if values.shape != labels.shape:
+        raise ValueError(
+            f"The values shape {values.shape} doesn't match the labels shape {labels.shape}."
+        )
+
+    # group all the cells at once, the cells outside of the areas are dropped
+    stats = [stats] if isinstance(stats, str) else stats
+    mask = labels > 0
+    df = pd.Series(values[mask]).groupby(labels[mask]).agg(stats)
+    df.index = pd.Index(np.asarray(gids)[df.index - 1], name="GID")
+
+    return df.reindex(pd.Index(gids, name="GID"))
+
+
+@versionadded(version="0.5.4", reason="Add the export function.")
+def export(
+    path: Union[str, Path],
+    name: Union[str, List[str]] = "",
+    admin: Union[str, List[str]] = "",
+    content_level: int = -1,
+    max_workers: Optional[int] = None,
+) -> Path:
+    """
+    Write the requested administrative boundaries directly in a file without loading them all in memory.
+
+    The parameters are the same as :code:`Items` but each area (or each country of a continent) is downloaded in parallel and spooled to a temporary folder, the file is then written chunk by chunk with the columns of all the areas. In a GeoParquet file, each area is saved in its own row group. The format is set from the file extension: ".parquet" for GeoParquet or ".gpkg" for GeoPackage.
+
+    Args:
+        path: The destination file.
+        name: The name of an administrative area. Cannot be set along with :code:`admin`. it can be a list or a single name.
+        admin: The id of an administrative area in the GADM nomenclature. Cannot be set along with :code:`name`. It can be a list or a single admin code.
+        content_level: The level to use in the final dataset. Default to -1 (use level from the area).
+        max_workers: The number of areas downloaded at the same time. Default to None (let Python decide).
+
+    Returns:
+        The path to the written file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    if path.suffix not in [".parquet", ".gpkg"]:
+        raise ValueError(
+            f'The file format "{path.suffix}" is not supported, use ".parquet" or ".gpkg".'
+        )
+
+    # the areas are not sharing the same columns (e.g. TYPE_2 only exists in countries with a
+    # second level) so they are first spooled to disk to gather all of them before writing the file
+    with tempfile.TemporaryDirectory() as folder:
+        chunks: List[Path] = []
+        columns: Dict[str, np.dtype] = {}
+
+        def spool(gdf: gpd.GeoDataFrame):
+            """Save a single area in the temporary folder."""
+            chunks.append(Path(folder) / f"{len(chunks)}.parquet")
+            gdf.to_parquet(chunks[-1])
+            for c, dtype in gdf.dtypes.items():
+                columns.setdefault(c, dtype)
+
+        # only keep a limited number of areas in memory at the same time
+        window = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures: deque = deque()
+            for n, a in _requests(name, admin):
+                # threads don't inherit the context, run each request in a copy of the current one
+                futures.append(executor.submit(copy_context().run, Items, n, a, content_level))
+                if len(futures) >= window:
+                    spool(gpd.GeoDataFrame(futures.popleft().result()))
+            while futures:
+                spool(gpd.GeoDataFrame(futures.popleft().result()))
+
+        # start from a clean file as the GeoPackage driver only append data
+        path.unlink(missing_ok=True)
+
+        writer = None
+        for chunk in chunks:
+            # all the chunks are sharing the same columns in the same order, the missing ones are
+            # left empty. Only the text columns are cast, the numeric ones (e.g. UID) keep their type
+            gdf = gpd.read_parquet(chunk)
+            geometry = gdf.geometry.name
+            attributes = [c for c in columns if c != geometry]
+            strings = [c for c in attributes if pd.api.types.is_string_dtype(columns[c])]
+            gdf = gdf.reindex(columns=[*attributes, geometry]).astype(
+                {c: "string" for c in strings}
+            )
+
+            if path.suffix == ".gpkg":
+                gdf.to_file(path, driver="GPKG", mode="a" if path.is_file() else "w")
+                continue
+
+            table = pa.Table.from_pandas(gdf.to_wkb(), preserve_index=False)
+            if writer is None:
+                crs = gdf.crs.to_json_dict() if gdf.crs else None
+                column: Dict[str, object] = {"encoding": "WKB", "geometry_types": [], "crs": crs}
+                geo = {
+                    "version": "1.0.0",
+                    "primary_column": geometry,
+                    "columns": {geometry: column},
+                }
+                schema = table.schema.with_metadata({b"geo": json.dumps(geo).encode()})
+                writer = pq.ParquetWriter(path, schema, compression="snappy")
+            writer.write_table(table.cast(writer.schema))
+
+        if writer is not None:
+            writer.close()
+
+    return path
+
 
 @deprecated(version="0.5.2", reason="Use the Names class instead.")
 class AdmNames(Names):
@@ -9,18 +9,92 @@ When GADM is releasing a new version the table should be updated to make sure th
 import argparse
 import tempfile
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyogrio
+import shapely
+from pyproj import Geod
 from tqdm import tqdm
 
-from pygadm import __gadm_version__
+from pygadm import (
+    __gadm_alias__,
+    __gadm_attributes__,
+    __gadm_attributes_data__,
+    __gadm_data__,
+    __gadm_version__,
+    _data_file,
+    _keys,
+)
 
 parser = argparse.ArgumentParser(description=__doc__, usage="refresh_database")
 
+# number of features read at once by each process
+chunk_size = 5000
+
+
+def outward(values: np.ndarray, direction: float) -> np.ndarray:
+    """
+    Cast coordinates to float32, rounding them in the requested direction when they are not exact.
+
+    Args:
+        values: The float64 coordinates.
+        direction: -inf to round the minimums down, inf to round the maximums up.
+
+    Returns:
+        The float32 coordinates.
+    """
+    rounded = values.astype("float32")
+    inexact = rounded < values if direction > 0 else rounded > values
+    return np.where(inexact, np.nextafter(rounded, np.float32(direction)), rounded)
+
+
+def read_layer(file: Path, level: int, rows: slice) -> pd.DataFrame:
+    """
+    Read a chunk of a layer of the GADM file and replace its geometries by a set of numeric attributes.
+
+    Args:
+        file: The path to the GADM geopackage.
+        level: The administrative level of the layer to read.
+        rows: The features of the layer to read.
+
+    Returns:
+        The attributes of the features with their GADM code ("GID"), the geodesic area (km²), a representative point, the bounding box and the number of vertices of each geometry.
+    """
+    gdf = gpd.read_file(file, layer=f"ADM_{level}", rows=rows)
+    geometries = gdf.geometry.values
+
+    geod = Geod(ellps="WGS84")
+    area = [abs(geod.geometry_area_perimeter(g)[0]) / 1e6 for g in geometries]
+    points = shapely.point_on_surface(geometries)
+    bounds = shapely.bounds(geometries)
+
+    # all the attributes are saved in 32 bits, the bounding box is rounded outward so that it
+    # still contains the whole geometry
+    attributes = pd.DataFrame(
+        {
+            "GID": gdf[f"GID_{level}"],
+            "AREA": area,
+            "LON": shapely.get_x(points),
+            "LAT": shapely.get_y(points),
+            "MINX": outward(bounds[:, 0], -np.inf),
+            "MINY": outward(bounds[:, 1], -np.inf),
+            "MAXX": outward(bounds[:, 2], np.inf),
+            "MAXY": outward(bounds[:, 3], np.inf),
+            "VERTICES": shapely.get_num_coordinates(geometries),
+        },
+        index=gdf.index,
+    ).astype({"AREA": "float32", "LON": "float32", "LAT": "float32", "VERTICES": "int32"})
+
+    return pd.concat([pd.DataFrame(gdf.drop(columns=gdf.geometry.name)), attributes], axis=1)
+
+
 if __name__ == "__main__":
     # read arguments
     parser.add_argument(
@@ -31,12 +105,24 @@ if __name__ == "__main__":
         required=False,
         type=Path,
     )
+    parser.add_argument(
+        "-v",
+        dest="version",
+        metavar="410",
+        help="(str) : the GADM version without dots, default to the current version",
+        required=False,
+        default=__gadm_version__,
+        type=str,
+    )
 
     # parse arguments
     args = parser.parse_args()
+    version = vars(args)["version"]
 
     # url of the gadm files
-    url = f"https://geodata.ucdavis.edu/gadm/gadm4.1/gadm_{__gadm_version__}-level.zip"
+    url = (
+        f"https://geodata.ucdavis.edu/gadm/gadm{version[0]}.{version[1]}/gadm_{version}-levels.zip"
+    )
 
     # read the all the geodata available in the server at once
     with tempfile.TemporaryDirectory() as tmp_dir:
@@ -59,23 +145,32 @@ if __name__ == "__main__":
                     f.write(chunk)
 
         # unzip file
-        file = Path(tmp_dir) / f"gadm_{__gadm_version__}-levels.gpkg"
+        file = Path(tmp_dir) / f"gadm_{version}-levels.gpkg"
         with zipfile.ZipFile(zip_file, "r") as zip_ref:
             zip_ref.extractall(Path(tmp_dir))
 
-        # read the file layer by layer
-        gid_0 = gpd.read_file(file, layer="ADM_0", ignore_geometry=True)
-        gid_1 = gpd.read_file(file, layer="ADM_1", ignore_geometry=True)
-        gid_2 = gpd.read_file(file, layer="ADM_2", ignore_geometry=True)
-        gid_3 = gpd.read_file(file, layer="ADM_3", ignore_geometry=True)
-        gid_4 = gpd.read_file(file, layer="ADM_4", ignore_geometry=True)
-        gid_5 = gpd.read_file(file, layer="ADM_5", ignore_geometry=True)
+        # read the layers in chunks of features so that each process only keeps a few geometries
+        # in memory, the geometry attributes are computed in parallel
+        levels, chunks = [], []
+        for level in range(6):
+            features = pyogrio.read_info(file, layer=f"ADM_{level}")["features"]
+            for start in range(0, features, chunk_size):
+                levels.append(level)
+                chunks.append(slice(start, start + chunk_size))
+        with ProcessPoolExecutor() as executor:
+            layer_list = list(executor.map(partial(read_layer, file), levels, chunks))
 
         # concatenate all the df in area size order
-        df = pd.concat([gid_0, gid_1, gid_2, gid_3, gid_4, gid_5])
+        df = pd.concat(layer_list, ignore_index=True)
+
+    # the geometry attributes are saved in a separated table only loaded on demand
+    attributes_df = df[["GID", *__gadm_attributes__]]
+    filename = _data_file(__gadm_attributes_data__, version)
+    attributes_df.to_parquet(filename, compression="Brotli", index=False)
 
     # change database structure to meet pygadm requirements
-    df = df.fillna("").rename(columns={"COUNTRY": "NAME_0"})
+    df = df.drop(columns=["GID", *__gadm_attributes__]).fillna("")
+    df = df.rename(columns={"COUNTRY": "NAME_0"})
 
     # filter all columns but the GID and the NAME
     # we are not including the VARNAME to keep the file size under 3Mo
@@ -84,8 +179,35 @@ if __name__ == "__main__":
     columns += [f"NAME_{i}" for i in range(6)]
     df_filtered = df.filter(items=columns)
 
+    # precompute the normalized keys used to compare the names
+    for i in range(6):
+        df_filtered[f"KEY_{i}"] = _keys(df_filtered[f"NAME_{i}"])
+
     # save it in the data folder
-    filename = Path(__file__).parents[1] / "data" / "gadm_database.parquet"
+    # each version is saved in its own file
+    filename = _data_file(__gadm_data__, version)
 
     # specifying the protocol for compatibility with Python 3.7
     df_filtered.to_parquet(filename, compression="Brotli")
+
+    # the alternative names are saved in a separated index only loaded on demand
+    # VARNAME can embed multiple names separated by "|"
+    alias_list = []
+    for i in range(1, 6):
+        for column in [f"VARNAME_{i}", f"NL_NAME_{i}"]:
+            if column not in df.columns:
+                continue
+            alias = df[df[column] != ""].filter([f"GID_{i}", column])
+            alias = alias.rename(columns={f"GID_{i}": "GID", column: "ALIAS"})
+            alias["ALIAS"] = alias.ALIAS.str.split("|")
+            alias_list.append(alias.explode("ALIAS").assign(LEVEL=i))
+
+    alias_df = pd.concat(alias_list)
+    alias_df["ALIAS"] = alias_df.ALIAS.str.strip()
+    alias_df = alias_df[alias_df.ALIAS != ""]
+    alias_df["KEY"] = _keys(alias_df.ALIAS)
+    alias_df = alias_df.drop_duplicates(subset=["KEY", "GID"], ignore_index=True)
+    alias_df = alias_df.astype({"LEVEL": "int8"})[["KEY", "ALIAS", "GID", "LEVEL"]]
+
+    filename = _data_file(__gadm_alias__, version)
+    alias_df.to_parquet(filename, compression="Brotli")
@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 
 import pandas as pd
+import shapely
 
 import pygadm
 
@@ -56,3 +57,16 @@ def test_orphan():
         if exist is False:
             orphan.append(country)
     assert len(orphan) == 0, ",".join(orphan)
+
+
+def test_region():
+    """Check that the continent outline is a single feature covering all its countries."""
+    gdf = pygadm.Items(name="antartica")
+    region = pygadm.Region(name="antartica")
+    assert len(region) == 1
+    assert region.total_bounds.round(4).tolist() == gdf.total_bounds.round(4).tolist()
+
+    simplified = pygadm.Region(name="antartica", tolerance=0.1)
+    assert shapely.get_num_coordinates(simplified.geometry.values) < shapely.get_num_coordinates(
+        region.geometry.values
+    )
@@ -0,0 +1,38 @@
+"""Tests of the ``export`` function."""
+
+import geopandas as gpd
+import pytest
+
+import pygadm
+
+
+def test_parquet(tmp_path):
+    """Export several areas in a GeoParquet file."""
+    file = pygadm.export(tmp_path / "areas.parquet", admin=["SGP", "LUX"])
+    gdf = gpd.read_parquet(file)
+    assert gdf.GID_0.tolist() == ["SGP", "LUX"]
+    assert gdf.crs.to_epsg() == 4326
+
+    # the numeric columns are not converted to strings
+    assert gdf.UID.dtype == pygadm.Items(admin="SGP").UID.dtype
+
+
+def test_gpkg(tmp_path):
+    """Export several areas in a GeoPackage file."""
+    file = pygadm.export(tmp_path / "areas.gpkg", name=["Singapore", "Luxembourg"])
+    gdf = gpd.read_file(file)
+    assert gdf.GID_0.tolist() == ["SGP", "LUX"]
+
+
+def test_columns(tmp_path):
+    """Export areas that are not sharing the same columns."""
+    file = pygadm.export(tmp_path / "areas.parquet", admin=["SGP", "LUX.1_1"])
+    gdf = gpd.read_parquet(file)
+    assert gdf.GID_1.tolist() == ["", "LUX.1_1"]
+    assert gdf.TYPE_1.notna().tolist() == [False, True]
+
+
+def test_wrong_format(tmp_path):
+    """Request an unsupported file format."""
+    with pytest.raises(ValueError):
+        pygadm.export(tmp_path / "areas.shp", admin="SGP")
@@ -1,5 +1,8 @@
 """Tests of the ``get_items`` function."""
 
+import json
+from types import SimpleNamespace
+
 import pandas as pd
 import pytest
 
@@ -121,3 +124,77 @@ def test_sub_admin(dataframe_regression):
     """Request a sublevel."""
     gdf = pygadm.Items(admin="SGP.1_1")
     dataframe_regression.check(gdf[["GID_1", "NAME_1", "GID_0", "NAME_0"]])
+
+
+def test_dissolve_to():
+    """Aggregate a sublevel request to the coarser levels."""
+    gdf = pygadm.Items(admin="SGP", content_level=1)
+
+    country = gdf.dissolve_to(0)
+    assert country.GID_0.tolist() == ["SGP"]
+    assert country.total_bounds.round(4).tolist() == gdf.total_bounds.round(4).tolist()
+
+    groups = {"center": ["SGP.1_1"], "others": ["SGP.2_1", "SGP.3_1"]}
+    regions = gdf.dissolve_to(1, groups=groups)
+    assert regions.group.tolist() == ["center", "others"]
+
+    with pytest.raises(ValueError):
+        gdf.dissolve_to(2)
+
+    # the cached aggregations follow the modifications of the data
+    gdf.drop(index=gdf.index[gdf.GID_1 == "SGP.1_1"], inplace=True)
+    assert "SGP.1_1" not in gdf.dissolve_to(1).GID_1.tolist()
+
+
+def test_to_tiles(tmp_path):
+    """Generate the vector tiles of an area."""
+    mapbox_vector_tile = pytest.importorskip("mapbox_vector_tile")
+    gdf = pygadm.Items(name="Singapore")
+
+    folder = gdf.to_tiles(tmp_path / "tiles", min_zoom=0, max_zoom=2)
+    assert (folder / "0" / "0" / "0.pbf").is_file()
+
+    # the attributes are saved in the features of the tile
+    tile = mapbox_vector_tile.decode((folder / "0" / "0" / "0.pbf").read_bytes())
+    properties = tile["gadm"]["features"][0]["properties"]
+    assert properties["GID_0"] == "SGP"
+    assert "nan" not in properties.values()
+
+    archive = gdf.to_tiles(tmp_path / "tiles.mbtiles", min_zoom=0, max_zoom=2)
+    assert archive.is_file()
+
+
+def test_validate():
+    """Request the repair of the invalid geometries."""
+    gdf = pygadm.Items(admin="SGP", content_level=1, validate="repair")
+    assert gdf.is_valid.all()
+    assert "REPAIRED" not in gdf.columns
+    assert isinstance(gdf.attrs["repaired"], list)
+
+    with pytest.raises(ValueError):
+        pygadm.Items(admin="SGP", validate="t0t0")
+
+
+def test_validate_invalid(monkeypatch, tmp_path):
+    """Repair an invalid geometry and read it back from the cache."""
+    # replace the first area of the downloaded file by a self-intersecting polygon
+    get, gids = pygadm.session.get, []
+
+    def session_get(url):
+        data = json.loads(get(url).content)
+        gids.append(data["features"][0]["properties"]["GID_1"])
+        bowtie = [[103.6, 1.2], [103.7, 1.3], [103.7, 1.2], [103.6, 1.3], [103.6, 1.2]]
+        data["features"][0]["geometry"] = {"type": "Polygon", "coordinates": [bowtie]}
+        return SimpleNamespace(content=json.dumps(data).encode())
+
+    monkeypatch.setattr(pygadm.session, "get", session_get)
+    monkeypatch.setattr(pygadm, "__gadm_cache__", tmp_path)
+
+    gdf = pygadm.Items(admin="SGP", content_level=1, validate="repair")
+    assert gdf.is_valid.all()
+    assert gdf.attrs["repaired"] == gids
+
+    # the second request reads the repaired file from the cache
+    gdf = pygadm.Items(admin="SGP", content_level=1, validate="repair")
+    assert gdf.attrs["repaired"] == gids
+    assert len(gids) == 1
@@ -99,3 +99,78 @@ def test_adm_names():
     with pytest.warns(DeprecationWarning):
         df2 = pygadm.AdmNames(name="Singapore")
         assert df1.equals(df2)
+
+
+@pytest.mark.skipif(
+    not pygadm.__gadm_alias__.is_file(), reason="The alternative names index is not built."
+)
+def test_alias():
+    """Request an area from one of its alternative names."""
+    with pytest.raises(ValueError):
+        pygadm.Names(name="北京")
+
+    df = pygadm.Names(name="北京", alias=True)
+    assert df.GID_1.tolist() == ["CHN.2_1"]
+
+
+def test_alias_missing(monkeypatch, tmp_path):
+    """Request an alias search without the index of alternative names."""
+    monkeypatch.setattr(pygadm, "__gadm_alias__", tmp_path / "gadm_alias.parquet")
+    pygadm._alias_df.cache_clear()
+    with pytest.raises(ValueError):
+        pygadm.Names(name="北京", alias=True)
+    pygadm._alias_df.cache_clear()
+
+
+def test_accent_insensitive():
+    """Request an area without respecting the accents and the punctuation."""
+    df1 = pygadm.Names(name="Côte d'Ivoire")
+    df2 = pygadm.Names(name="cote d ivoire")
+
+    assert df1.equals(df2)
+
+
+def test_special_characters():
+    """Request an area with characters that have a meaning in regex."""
+    # the punctuation is ignored like any other separator, it's never used as a pattern
+    df1 = pygadm.Names(name="Singapore.*")
+    df2 = pygadm.Names(name="Singapore")
+    assert df1.equals(df2)
+
+    with pytest.raises(ValueError):
+        pygadm.Names(name="S.*")
+
+    with pytest.raises(ValueError):
+        pygadm.Names(name="()")
+
+
+@pytest.mark.skipif(
+    not pygadm.__gadm_attributes_data__.is_file(), reason="The attributes table is not built."
+)
+def test_attributes():
+    """Request the geometry attributes of the areas."""
+    df = pygadm.Names(admin="SGP", content_level=1, attributes=True)
+    assert df.columns.tolist()[2:] == pygadm.__gadm_attributes__
+    assert (df.AREA > 0).all()
+    assert ((df.MINX <= df.LON) & (df.LON <= df.MAXX)).all()
+    assert ((df.MINY <= df.LAT) & (df.LAT <= df.MAXY)).all()
+
+
+def test_gadm_version():
+    """Request the names of a specific GADM version."""
+    with pygadm.gadm_version(pygadm.__gadm_version__):
+        df = pygadm.Names(name="Singapore")
+    assert df.equals(pygadm.Names(name="Singapore"))
+
+    with pytest.raises(ValueError):
+        with pygadm.gadm_version("t0t0"):
+            pass
+
+
+def test_attributes_missing(monkeypatch, tmp_path):
+    """Request the attributes without the attributes table."""
+    monkeypatch.setattr(pygadm, "__gadm_attributes_data__", tmp_path / "gadm_attributes.parquet")
+    pygadm._attributes_df.cache_clear()
+    with pytest.raises(ValueError):
+        pygadm.Names(admin="SGP", attributes=True)
+    pygadm._attributes_df.cache_clear()
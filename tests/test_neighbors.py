@@ -0,0 +1,32 @@
+"""Tests of the ``Neighbors`` class."""
+
+import pytest
+
+import pygadm
+
+
+def test_empty():
+    """Empty request."""
+    with pytest.raises(Exception):
+        pygadm.Neighbors()
+
+
+def test_neighbors():
+    """Request the neighbors of a single area."""
+    df = pygadm.Neighbors(admin="SGP.1_1")
+    assert set(df.GID) == {"SGP.1_1"}
+    assert set(df.NEIGHBOR) == {"SGP.2_1", "SGP.3_1", "SGP.4_1", "SGP.5_1"}
+
+
+def test_multiple_input():
+    """Request the neighbors of several areas at once."""
+    df = pygadm.Neighbors(admin=["SGP.1_1", "SGP.2_1"])
+    assert set(df.GID) == {"SGP.1_1", "SGP.2_1"}
+    assert "SGP.2_1" in df[df.GID == "SGP.1_1"].NEIGHBOR.tolist()
+    assert "SGP.1_1" in df[df.GID == "SGP.2_1"].NEIGHBOR.tolist()
+
+
+def test_country():
+    """Request the neighbors of a country."""
+    with pytest.raises(ValueError):
+        pygadm.Neighbors(admin="FRA")
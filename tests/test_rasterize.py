@@ -0,0 +1,34 @@
+"""Tests of the ``rasterize`` and ``zonal_stats`` functions."""
+
+import numpy as np
+import pytest
+
+import pygadm
+
+# a 0.01° grid covering Singapore
+transform = (0.01, 0, 103.6, 0, -0.01, 1.48)
+shape = (32, 49)
+
+
+def test_rasterize():
+    """Burn the areas of a country in a label grid."""
+    labels, gids = pygadm.rasterize(transform, shape, admin="SGP", content_level=1)
+    assert labels.shape == shape
+    assert gids == pygadm.Items(admin="SGP", content_level=1).GID_1.tolist()
+    assert set(np.unique(labels)) <= set(range(len(gids) + 1))
+    assert not labels.flags.writeable
+
+    # the labels are stored in the smallest integer type
+    assert labels.dtype == np.uint8
+
+
+def test_zonal_stats():
+    """Aggregate a grid in the areas of a country."""
+    labels, gids = pygadm.rasterize(transform, shape, admin="SGP", content_level=1)
+    df = pygadm.zonal_stats(np.ones(shape), labels, gids, ["mean", "count"])
+    assert df.index.tolist() == gids
+    assert (df["mean"].dropna() == 1).all()
+    assert df["count"].sum() == (labels > 0).sum()
+
+    with pytest.raises(ValueError):
+        pygadm.zonal_stats(np.ones((2, 2)), labels, gids)